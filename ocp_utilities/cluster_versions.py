@@ -1,8 +1,13 @@
 import functools
+import gzip
+import os
 import re
+import tempfile
+from collections import defaultdict
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from ocp_resources.cluster_version import ClusterVersion
 from simple_logger.logger import get_logger
 from semver import Version
@@ -10,15 +15,99 @@ from semver import Version
 from ocp_utilities.exceptions import ClusterVersionNotFoundError
 
 LOGGER = get_logger(name="ocp-versions")
+# <major>.<minor>.<patch>[-<pre_release>], release page versions may be prefixed with "*"
+RELEASE_VERSION_RE = re.compile(r"^\*?\s*(\d+)\.(\d+)\.\d+(?:-([0-9A-Za-z.-]+))?")
+CLUSTER_VERSION_MESSAGE_RE = re.compile(r"\d+(?:\.\d+)+")
+OPENSHIFT_RELEASE_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "ocp-utilities"
+)
+
+
+@functools.cache
+def _get_requests_session():
+    # Shared by all release page fetches to reuse pooled connections
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+
+def _write_file_atomic(file_path, content, compress=False):
+    fd, tmp_file_path = tempfile.mkstemp(dir=os.path.dirname(file_path))
+    try:
+        with open(fd, "wb") as tmp_fd:
+            tmp_fd.write(gzip.compress(content) if compress else content)
+        os.replace(tmp_file_path, file_path)
+    except BaseException:
+        os.unlink(tmp_file_path)
+        raise
+
+
+def get_openshift_release_page(url):
+    """
+    Get release page HTML, re-using the locally cached copy if the server reports it unchanged (ETag).
+
+    The raw body is returned undecoded; BeautifulSoup detects the encoding itself, which avoids requests' charset
+    detection on `.text`.
+
+    Args:
+        url (str): release page url
+
+    Returns:
+        bytes: release page HTML
+    """
+    cache_file = os.path.join(OPENSHIFT_RELEASE_CACHE_DIR, "openshift-release.html.gz")
+    etag_file = f"{cache_file}.etag"
+    cached_page = None
+    headers = {}
+    try:
+        with open(etag_file) as fd:
+            etag = fd.read()
+
+        with gzip.open(cache_file, "rb") as fd:
+            cached_page = fd.read()
+
+        headers["If-None-Match"] = etag
+    except (OSError, EOFError):
+        pass
+
+    req = _get_requests_session().get(url, headers=headers, timeout=30)
+    if req.status_code == requests.codes.not_modified and cached_page is not None:
+        LOGGER.info(f"{url} not modified, using cached {cache_file}")
+        return cached_page
+
+    # Error pages are not cached, a later 304 would serve them forever
+    req.raise_for_status()
+    if req.status_code == requests.codes.ok and (etag := req.headers.get("ETag")):
+        try:
+            os.makedirs(OPENSHIFT_RELEASE_CACHE_DIR, exist_ok=True)
+            # Page is written before its ETag, an interrupted update can only cause a re-download
+            _write_file_atomic(file_path=cache_file, content=req.content, compress=True)
+            _write_file_atomic(file_path=etag_file, content=etag.encode("utf-8"))
+        except OSError as ex:
+            LOGGER.warning(f"Failed to cache {url} under {OPENSHIFT_RELEASE_CACHE_DIR}: {ex}")
+
+    return req.content
 
 
 @functools.cache
 def parse_openshift_release_url():
+    """
+    Parse https://openshift-release.apps.ci.l2s4.p1.openshiftapps.com release tables.
+
+    Returns:
+        tuple: (version, status) text pairs, one per table row
+    """
     url = "https://openshift-release.apps.ci.l2s4.p1.openshiftapps.com"
     LOGGER.info(f"Parsing {url}")
-    req = requests.get(url)
-    soup = BeautifulSoup(req.text, "html.parser")
-    return soup.find_all("tr")
+    # Only table rows are needed, skip building the rest of the document tree
+    soup = BeautifulSoup(get_openshift_release_page(url=url), "html.parser", parse_only=SoupStrainer(name="tr"))
+    rows = []
+    for tr in soup.find_all("tr"):
+        tr_text = [_tr for _tr in tr.text.splitlines() if _tr]
+        if len(tr_text) >= 2:
+            rows.append((tr_text[0], tr_text[1]))
+
+    return tuple(rows)
 
 
 @functools.cache
@@ -38,26 +127,28 @@ def get_accepted_cluster_versions():
          'rc': {'4.15': ['4.15.0-0.rc-2022-05-25-113430']},
          'fc': {'4.15': ['4.15.0-0.fc-2022-05-25-113430']}}
     """
-    _accepted_version_dict = {}
-    for tr in parse_openshift_release_url():
-        version, status = [_tr for _tr in tr.text.splitlines() if _tr][:2]
-        if status == "Accepted":
-            semver_version = Version.parse(version.strip("*").strip())
-            base_version = f"{semver_version.major}.{semver_version.minor}"
-            if pre_release := semver_version.prerelease:
-                if "nightly" in pre_release:
-                    _accepted_version_dict.setdefault("nightly", {}).setdefault(base_version, []).append(version)
-                elif "ci" in pre_release:
-                    _accepted_version_dict.setdefault("ci", {}).setdefault(base_version, []).append(version)
-                else:
-                    # Handle ec, fc and rc (pre_release text is rc.1 or ec.1 or fc.1)
-                    _accepted_version_dict.setdefault(pre_release.split(".")[0], {}).setdefault(
-                        base_version, []
-                    ).append(version)
-            else:
-                _accepted_version_dict.setdefault("stable", {}).setdefault(base_version, []).append(version)
-
-    return _accepted_version_dict
+    _accepted_version_dict = defaultdict(lambda: defaultdict(list))
+    for version, status in parse_openshift_release_url():
+        if status != "Accepted":
+            continue
+
+        if not (version_match := RELEASE_VERSION_RE.match(version)):
+            continue
+
+        major, minor, pre_release = version_match.groups()
+        if not pre_release:
+            channel = "stable"
+        elif "nightly" in pre_release:
+            channel = "nightly"
+        elif "ci" in pre_release:
+            channel = "ci"
+        else:
+            # Handle ec, fc and rc (pre_release text is rc.1 or ec.1 or fc.1)
+            channel = pre_release.split(".")[0]
+
+        _accepted_version_dict[channel][f"{major}.{minor}"].append(version)
+
+    return {channel: dict(versions) for channel, versions in _accepted_version_dict.items()}
 
 
 def get_cluster_version(client=None):
@@ -76,7 +167,7 @@ def get_cluster_version(client=None):
         condition_status=cluster_version.Condition.Status.TRUE,
     ):
         try:
-            ocp_version = re.search(r"([\d.]+)", cluster_version_message).group()
+            ocp_version = CLUSTER_VERSION_MESSAGE_RE.search(cluster_version_message).group()
             LOGGER.info(f"Cluster version: {ocp_version}")
             return Version.parse(ocp_version)
 
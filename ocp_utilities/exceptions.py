@@ -1,3 +1,6 @@
+import json
+
+
 class NodeNotReadyError(Exception):
     pass
 
@@ -11,7 +14,19 @@ class PodsFailedOrPendingError(Exception):
 
 
 class NodesNotHealthyConditionError(Exception):
-    pass
+    def __init__(self, unhealthy_nodes_with_conditions):
+        super().__init__(unhealthy_nodes_with_conditions)
+        self.unhealthy_nodes_with_conditions = unhealthy_nodes_with_conditions
+
+    def __str__(self):
+        # Callers raising with a preformatted message keep it as is
+        if isinstance(self.unhealthy_nodes_with_conditions, str):
+            return self.unhealthy_nodes_with_conditions
+
+        return (
+            "Following are nodes with unhealthy condition/s:\n"
+            f"{json.dumps(self.unhealthy_nodes_with_conditions, indent=3)}"
+        )
 
 
 class CommandExecFailed(Exception):
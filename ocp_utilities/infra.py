@@ -1,4 +1,5 @@
 import base64
+import functools
 import importlib
 import json
 import os
@@ -32,6 +33,58 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 LOGGER = get_logger(name=__name__)
 
 
+def _is_incluster_without_kubeconfig():
+    # Service env variables are injected into every pod; a kubeconfig file, if present, still takes precedence
+    if not (os.environ.get("KUBERNETES_SERVICE_HOST") and os.environ.get("KUBERNETES_SERVICE_PORT")):
+        return False
+
+    return not any(
+        os.path.exists(os.path.expanduser(kubeconfig_path))
+        for kubeconfig_path in kubernetes.config.KUBE_CONFIG_DEFAULT_LOCATION.split(os.pathsep)
+    )
+
+
+def _get_incluster_client(**kwargs):
+    # Ref: https://github.com/kubernetes-client/python/blob/v26.1.0/kubernetes/base/config/incluster_config.py
+    LOGGER.info("Trying to get client via incluster_config")
+    client_configuration = kwargs.get("client_configuration") or kubernetes.client.Configuration()
+    kubernetes.config.incluster_config.load_incluster_config(
+        client_configuration=client_configuration,
+        try_refresh_token=kwargs.get("try_refresh_token", True),
+    )
+    return kubernetes.dynamic.DynamicClient(client=kubernetes.client.ApiClient(configuration=client_configuration))
+
+
+def _get_client(config_file=None, config_dict=None, context=None, **kwargs):
+    # Ref: https://github.com/kubernetes-client/python/blob/v26.1.0/kubernetes/base/config/kube_config.py
+    if config_dict:
+        return kubernetes.dynamic.DynamicClient(
+            client=kubernetes.config.new_client_from_config_dict(config_dict=config_dict, context=context, **kwargs)
+        )
+
+    if not config_file and _is_incluster_without_kubeconfig():
+        return _get_incluster_client(**kwargs)
+
+    try:
+        # Ref: https://github.com/kubernetes-client/python/blob/v26.1.0/kubernetes/base/config/__init__.py
+        LOGGER.info("Trying to get client via new_client_from_config")
+        return kubernetes.dynamic.DynamicClient(
+            client=kubernetes.config.new_client_from_config(config_file=config_file, context=context, **kwargs)
+        )
+    except MaxRetryError:
+        return _get_incluster_client(**kwargs)
+
+
+@functools.cache
+def _get_cached_client(config_file, config_dict_json, context, kwargs_items):
+    return _get_client(
+        config_file=config_file,
+        config_dict=json.loads(config_dict_json) if config_dict_json else None,
+        context=context,
+        **dict(kwargs_items),
+    )
+
+
 def get_client(config_file=None, config_dict=None, context=None, **kwargs):
     """
     Get a kubernetes client.
@@ -40,6 +93,9 @@ def get_client(config_file=None, config_dict=None, context=None, **kwargs):
     If none of them are passed, client will be created from default OS kubeconfig
     (environment variable or .kube folder).
 
+    Clients are cached per arguments: repeated calls return the same client, re-using its API discovery and
+    connection pool. Call `get_client.cache_clear()` to drop cached clients (e.g. after kubeconfig was changed).
+
     Args:
         config_file (str): path to a kubeconfig file.
         config_dict (dict): dict with kubeconfig configuration.
@@ -48,26 +104,61 @@ def get_client(config_file=None, config_dict=None, context=None, **kwargs):
     Returns:
         DynamicClient: a kubernetes client.
     """
-    # Ref: https://github.com/kubernetes-client/python/blob/v26.1.0/kubernetes/base/config/kube_config.py
-    if config_dict:
-        return kubernetes.dynamic.DynamicClient(
-            client=kubernetes.config.new_client_from_config_dict(config_dict=config_dict, context=context, **kwargs)
-        )
     try:
-        # Ref: https://github.com/kubernetes-client/python/blob/v26.1.0/kubernetes/base/config/__init__.py
-        LOGGER.info("Trying to get client via new_client_from_config")
-        return kubernetes.dynamic.DynamicClient(
-            client=kubernetes.config.new_client_from_config(config_file=config_file, context=context, **kwargs)
-        )
-    except MaxRetryError:
-        # Ref: https://github.com/kubernetes-client/python/blob/v26.1.0/kubernetes/base/config/incluster_config.py
-        LOGGER.info("Trying to get client via incluster_config")
-        return kubernetes.dynamic.DynamicClient(
-            client=kubernetes.config.incluster_config.load_incluster_config(
-                client_configuration=kwargs.get("client_configuration"),
-                try_refresh_token=kwargs.get("try_refresh_token", True),
-            )
-        )
+        config_dict_json = json.dumps(config_dict, sort_keys=True) if config_dict else None
+        kwargs_items = tuple(sorted(kwargs.items()))
+        hash(kwargs_items)
+    except TypeError:
+        # Arguments that can not be used as a cache key, e.g. a dict value in kwargs
+        return _get_client(config_file=config_file, config_dict=config_dict, context=context, **kwargs)
+
+    return _get_cached_client(
+        config_file=config_file,
+        config_dict_json=config_dict_json,
+        context=context,
+        kwargs_items=kwargs_items,
+    )
+
+
+get_client.cache_clear = _get_cached_client.cache_clear
+
+
+def _list_nodes_dicts(nodes):
+    """
+    Get nodes as plain dicts with a single LIST call instead of a GET per node.
+
+    The LIST response is decoded directly from JSON, skipping ResourceInstance wrapping of every node field.
+
+    Args:
+        nodes (list): List of Node objects
+
+    Returns:
+        dict: node name as key and node dict as value, in nodes order
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return {}
+
+    nodes_api = nodes[0].client.resources.get(api_version=Node.api_version, kind=Node.kind)
+    nodes_list_response = nodes_api.get(serialize=False)
+    listed_nodes_dicts = {
+        node_dict["metadata"]["name"]: node_dict for node_dict in json.loads(nodes_list_response.data)["items"]
+    }
+    # A node missing from the list falls back to its own GET, which raises if the node does not exist
+    return {node.name: listed_nodes_dicts.get(node.name) or node.instance.to_dict() for node in nodes}
+
+
+def _is_kubelet_ready(node_dict):
+    # Same check as Node.kubelet_ready, on an already fetched node
+    return any(
+        condition.get("reason") == "KubeletReady" and condition["status"] == Node.Condition.Status.TRUE
+        for condition in node_dict["status"]["conditions"]
+    )
+
+
+def _assert_nodes_ready(not_ready_nodes):
+    if not_ready_nodes:
+        raise NodeNotReadyError(f"Following nodes are not in ready state: {not_ready_nodes}")
 
 
 def assert_nodes_ready(nodes):
@@ -81,9 +172,18 @@ def assert_nodes_ready(nodes):
         NodeNotReadyError: Assert on node(s) in not ready state
     """
     LOGGER.info("Verify all nodes are ready.")
-    not_ready_nodes = [node.name for node in nodes if not node.kubelet_ready]
-    if not_ready_nodes:
-        raise NodeNotReadyError(f"Following nodes are not in ready state: {not_ready_nodes}")
+    _assert_nodes_ready(
+        not_ready_nodes=[
+            node_name
+            for node_name, node_dict in _list_nodes_dicts(nodes=nodes).items()
+            if not _is_kubelet_ready(node_dict=node_dict)
+        ]
+    )
+
+
+def _assert_nodes_schedulable(unschedulable_nodes):
+    if unschedulable_nodes:
+        raise NodeUnschedulableError(f"Following nodes are in unscheduled state: {unschedulable_nodes}")
 
 
 def assert_nodes_schedulable(nodes):
@@ -97,9 +197,38 @@ def assert_nodes_schedulable(nodes):
         NodeUnschedulableError: Asserts on node(s) not schedulable
     """
     LOGGER.info("Verify all nodes are schedulable.")
-    unschedulable_nodes = [node.name for node in nodes if node.instance.spec.unschedulable]
-    if unschedulable_nodes:
-        raise NodeUnschedulableError(f"Following nodes are in unscheduled state: {unschedulable_nodes}")
+    _assert_nodes_schedulable(
+        unschedulable_nodes=[
+            node_name
+            for node_name, node_dict in _list_nodes_dicts(nodes=nodes).items()
+            if node_dict["spec"].get("unschedulable")
+        ]
+    )
+
+
+def _list_pods_phases(pods):
+    """
+    Get pods phases with one LIST call per namespace instead of GET calls per pod.
+
+    Args:
+         pods (list): List of pod objects
+
+    Returns:
+        dict: (namespace, name) as key and phase as value, for existing pods which are not Running nor Succeeded
+    """
+    namespaces_pods = {}
+    for pod in pods:
+        namespaces_pods.setdefault(pod.namespace, pod)
+
+    pods_phases = {}
+    for namespace, pod in namespaces_pods.items():
+        pods_api = pod.client.resources.get(api_version=pod.api_version, kind=pod.kind)
+        for pod_instance in pods_api.get(
+            namespace=namespace, field_selector="status.phase!=Running,status.phase!=Succeeded"
+        ).items:
+            pods_phases[(namespace, pod_instance.metadata.name)] = pod_instance.status.phase
+
+    return pods_phases
 
 
 def assert_pods_failed_or_pending(pods):
@@ -114,20 +243,52 @@ def assert_pods_failed_or_pending(pods):
     """
     LOGGER.info("Verify all pods are not failed nor pending.")
 
-    failed_or_pending_pods = []
-    for pod in pods:
-        if pod.exists:
-            pod_status = pod.instance.status.phase
-            if pod_status in [pod.Status.PENDING, pod.Status.FAILED]:
-                failed_or_pending_pods.append(f"name: {pod.name}, namespace: {pod.namespace}, status: {pod_status}\n")
+    pods = list(pods)
+    pods_phases = _list_pods_phases(pods=pods)
+    failed_or_pending_pods = [
+        f"name: {pod.name}, namespace: {pod.namespace}, status: {pod_status}\n"
+        for pod in pods
+        if (pod_status := pods_phases.get((pod.namespace, pod.name))) in (pod.Status.PENDING, pod.Status.FAILED)
+    ]
 
     if failed_or_pending_pods:
-        failed_or_pending_pods_str = "\t".join(map(str, failed_or_pending_pods))
+        # Each pod line is indented with a tab under the message header
+        failed_or_pending_pods_str = "\t".join(failed_or_pending_pods)
         raise PodsFailedOrPendingError(
             f"The following pods are failed or pending:\n\t{failed_or_pending_pods_str}",
         )
 
 
+def _get_healthy_node_condition_type(healthy_node_condition_type=None):
+    if not healthy_node_condition_type:
+        healthy_node_condition_type = {
+            "OutOfDisk": Node.Condition.Status.FALSE,
+            "DiskPressure": Node.Condition.Status.FALSE,
+            "MemoryPressure": Node.Condition.Status.FALSE,
+            "NetworkUnavailable": Node.Condition.Status.FALSE,
+            "PIDPressure": Node.Condition.Status.FALSE,
+            Node.Condition.READY: Node.Condition.Status.TRUE,
+        }
+
+    if not isinstance(healthy_node_condition_type, dict):
+        raise TypeError(f"A dict is required but got type {type(healthy_node_condition_type)}")
+
+    return healthy_node_condition_type
+
+
+def _get_unhealthy_condition_types(node_dict, tracked_types, healthy_pairs):
+    return [
+        condition["type"]
+        for condition in node_dict["status"]["conditions"]
+        if condition["type"] in tracked_types and (condition["type"], condition["status"]) not in healthy_pairs
+    ]
+
+
+def _assert_nodes_in_healthy_condition(unhealthy_nodes_with_conditions):
+    if unhealthy_nodes_with_conditions:
+        raise NodesNotHealthyConditionError(unhealthy_nodes_with_conditions=unhealthy_nodes_with_conditions)
+
+
 def assert_nodes_in_healthy_condition(
     nodes,
     healthy_node_condition_type=None,
@@ -153,40 +314,88 @@ def assert_nodes_in_healthy_condition(
             PIDPressure, NetworkUnavailable, etc condition is True
     """
     LOGGER.info("Verify all nodes are in a healthy condition.")
+    healthy_node_condition_type = _get_healthy_node_condition_type(
+        healthy_node_condition_type=healthy_node_condition_type
+    )
+    tracked_types = frozenset(healthy_node_condition_type)
+    healthy_pairs = frozenset(healthy_node_condition_type.items())
+    unhealthy_nodes_with_conditions = {}
+    for node_name, node_dict in _list_nodes_dicts(nodes=nodes).items():
+        if unhealthy_condition_types := _get_unhealthy_condition_types(
+            node_dict=node_dict, tracked_types=tracked_types, healthy_pairs=healthy_pairs
+        ):
+            unhealthy_nodes_with_conditions[node_name] = unhealthy_condition_types
 
-    if not healthy_node_condition_type:
-        healthy_node_condition_type = {
-            "OutOfDisk": Node.Condition.Status.FALSE,
-            "DiskPressure": Node.Condition.Status.FALSE,
-            "MemoryPressure": Node.Condition.Status.FALSE,
-            "NetworkUnavailable": Node.Condition.Status.FALSE,
-            "PIDPressure": Node.Condition.Status.FALSE,
-            Node.Condition.READY: Node.Condition.Status.TRUE,
-        }
+    _assert_nodes_in_healthy_condition(unhealthy_nodes_with_conditions=unhealthy_nodes_with_conditions)
 
-    if not isinstance(healthy_node_condition_type, dict):
-        raise TypeError(f"A dict is required but got type {type(healthy_node_condition_type)}")
 
+def assert_cluster_sanity(nodes, healthy_node_condition_type=None):
+    """
+    Validates nodes are ready, schedulable and in a healthy condition, fetching and checking the nodes only once.
+
+    When several checks fail, the error of the first failing check (ready, schedulable, healthy) is raised.
+
+    Args:
+         nodes(list): List of Node objects
+
+         healthy_node_condition_type (dict, optional): see assert_nodes_in_healthy_condition
+
+    Raises:
+        NodeNotReadyError: Assert on node(s) in not ready state
+        NodeUnschedulableError: Asserts on node(s) not schedulable
+        NodesNotHealthyConditionError: if any node condition is not in its healthy status
+    """
+    LOGGER.info("Verify all nodes are ready, schedulable and in a healthy condition.")
+    healthy_node_condition_type = _get_healthy_node_condition_type(
+        healthy_node_condition_type=healthy_node_condition_type
+    )
+    tracked_types = frozenset(healthy_node_condition_type)
+    healthy_pairs = frozenset(healthy_node_condition_type.items())
+    not_ready_nodes = []
+    unschedulable_nodes = []
     unhealthy_nodes_with_conditions = {}
-    for node in nodes:
-        unhealthy_condition_type_list = [
-            condition.type
-            for condition in node.instance.status.conditions
-            if condition.type in healthy_node_condition_type
-            and healthy_node_condition_type[condition.type] != condition.status
-        ]
+    for node_name, node_dict in _list_nodes_dicts(nodes=nodes).items():
+        if not _is_kubelet_ready(node_dict=node_dict):
+            not_ready_nodes.append(node_name)
 
-        if unhealthy_condition_type_list:
-            unhealthy_nodes_with_conditions[node.name] = unhealthy_condition_type_list
+        if node_dict["spec"].get("unschedulable"):
+            unschedulable_nodes.append(node_name)
 
-    if unhealthy_nodes_with_conditions:
-        nodes_unhealthy_condition_error_str = json.dumps(
-            unhealthy_nodes_with_conditions,
-            indent=3,
-        )
-        raise NodesNotHealthyConditionError(
-            f"Following are nodes with unhealthy condition/s:\n{nodes_unhealthy_condition_error_str}"
-        )
+        if unhealthy_condition_types := _get_unhealthy_condition_types(
+            node_dict=node_dict, tracked_types=tracked_types, healthy_pairs=healthy_pairs
+        ):
+            unhealthy_nodes_with_conditions[node_name] = unhealthy_condition_types
+
+    _assert_nodes_ready(not_ready_nodes=not_ready_nodes)
+    _assert_nodes_schedulable(unschedulable_nodes=unschedulable_nodes)
+    _assert_nodes_in_healthy_condition(unhealthy_nodes_with_conditions=unhealthy_nodes_with_conditions)
+
+
+@functools.cache
+def _get_collect_data_function(collect_data_function):
+    module_name, function_name = collect_data_function.rsplit(".", 1)
+    import_module = importlib.import_module(name=module_name)
+    return getattr(import_module, function_name)
+
+
+DATA_COLLECTOR_DICT_CACHE = {}
+
+
+def _get_data_collector_dict():
+    # A data collector YAML file is parsed once per path; py_config is a live dict and is read on every call
+    data_collector_yaml = os.environ.get("OPENSHIFT_PYTHON_WRAPPER_DATA_COLLECTOR_YAML")
+    if not data_collector_yaml:
+        return get_data_collector_dict()
+
+    if data_collector_yaml not in DATA_COLLECTOR_DICT_CACHE:
+        data_collector_dict = get_data_collector_dict()
+        # A missing or unreadable file is not cached, it is read again once created
+        if data_collector_dict is None:
+            return None
+
+        DATA_COLLECTOR_DICT_CACHE[data_collector_yaml] = data_collector_dict
+
+    return DATA_COLLECTOR_DICT_CACHE[data_collector_yaml]
 
 
 class DynamicClassCreator:
@@ -218,14 +427,13 @@ class DynamicClassCreator:
 
             def clean_up(self):
                 try:
-                    data_collector_dict = get_data_collector_dict()
+                    data_collector_dict = _get_data_collector_dict()
                     if data_collector_dict:
                         data_collector_directory = get_data_collector_base_dir(data_collector_dict=data_collector_dict)
 
-                        collect_data_function = data_collector_dict["collect_data_function"]
-                        module_name, function_name = collect_data_function.rsplit(".", 1)
-                        import_module = importlib.import_module(name=module_name)
-                        collect_data_function = getattr(import_module, function_name)
+                        collect_data_function = _get_collect_data_function(
+                            collect_data_function=data_collector_dict["collect_data_function"]
+                        )
                         LOGGER.info(f"[Data collector] Collecting data for {self.kind} {self.name}")
                         collect_data_function(
                             directory=data_collector_directory,
@@ -234,8 +442,7 @@ class DynamicClassCreator:
                         )
                 except Exception as exception_:
                     LOGGER.warning(
-                        "[Data collector] failed to collect data for"
-                        f" {self.kind} {self.name}\nexception: {exception_}"
+                        f"[Data collector] failed to collect data for {self.kind} {self.name}\nexception: {exception_}"
                     )
                 super().clean_up()
 
@@ -243,6 +450,9 @@ class DynamicClassCreator:
         return BaseResource
 
 
+DYNAMIC_CLASS_CREATOR = DynamicClassCreator()
+
+
 def cluster_resource(base_class):
     """
     Base class for all resources in order to override clean_up() method to collect resource data.
@@ -273,8 +483,7 @@ def cluster_resource(base_class):
         ) as vm:
             running_vm(vm=vm)
     """
-    creator = DynamicClassCreator()
-    return creator(base_class=base_class)
+    return DYNAMIC_CLASS_CREATOR(base_class=base_class)
 
 
 def create_icsp_command(image, source_url, folder_name, pull_secret=None, filter_options=""):
@@ -289,13 +498,22 @@ def create_icsp_command(image, source_url, folder_name, pull_secret=None, filter
         filter_options (str): when filter passed it will choose image from multiple variants.
 
     Returns:
-        str: base command to create icsp in the cluster.
+        list: base command to create icsp in the cluster, as arguments list.
     """
-    base_command = (
-        f"oc adm catalog mirror {image} {source_url} --manifests-only --to-manifests {folder_name} {filter_options}"
-    )
+    base_command = [
+        "oc",
+        "adm",
+        "catalog",
+        "mirror",
+        image,
+        source_url,
+        "--manifests-only",
+        "--to-manifests",
+        folder_name,
+        *shlex.split(filter_options),
+    ]
     if pull_secret:
-        base_command = f"{base_command} --registry-config={pull_secret}"
+        base_command.append(f"--registry-config={pull_secret}")
     return base_command
 
 
@@ -308,7 +526,7 @@ def generate_icsp_file(folder_name, image, source_url, pull_secret=None, filter_
         filter_options=filter_options,
     )
     assert run_command(
-        command=shlex.split(base_command),
+        command=base_command,
         verify_stderr=False,
     )[0]
 
@@ -340,7 +558,7 @@ def dict_base64_encode(_dict):
     Returns:
         str: given _dict encoded in base64
     """
-    return base64.b64encode(json.dumps(_dict).encode("ascii")).decode("utf-8")
+    return base64.b64encode(json.dumps(_dict, separators=(",", ":")).encode("ascii")).decode("ascii")
 
 
 def create_update_secret(secret_data_dict, name, namespace, admin_client=None):
@@ -370,8 +588,8 @@ def create_update_secret(secret_data_dict, name, namespace, admin_client=None):
     secret_key = ".dockerconfigjson"
     auths_key = "auths"
 
-    if secret.exists:
-        old_secret_data_dict = json.loads(base64.b64decode(secret.instance.data[secret_key]))[auths_key]
+    if secret_instance := secret.exists:
+        old_secret_data_dict = json.loads(base64.b64decode(secret_instance.data[secret_key]))[auths_key]
         old_secret_data_dict.update(secret_data_dict[auths_key])
         secret_data_encoded = dict_base64_encode(_dict={auths_key: old_secret_data_dict})
 
@@ -382,3 +600,33 @@ def create_update_secret(secret_data_dict, name, namespace, admin_client=None):
     secret.data_dict = {secret_key: dict_base64_encode(_dict=secret_data_dict)}
 
     return secret.deploy()
+
+
+def create_update_secrets_batch(secrets_data, admin_client=None):
+    """
+    Update existing secrets or create new secrets; secret type - dockerconfigjson
+
+    All updates of the same secret are merged first, so each secret is read and patched (or created) only once.
+
+    Args:
+        secrets_data (list): List of (name, namespace, secret_data_dict) tuples, secret_data_dict format is the same
+            as in create_update_secret. Updates are merged in order, a later registry entry overrides an earlier one.
+        admin_client (DynamicClient): Cluster client.
+
+    Returns:
+        list: Secret objects, one per (name, namespace)
+    """
+    auths_key = "auths"
+    secrets_auths = {}
+    for name, namespace, secret_data_dict in secrets_data:
+        secrets_auths.setdefault((name, namespace), {}).update(secret_data_dict[auths_key])
+
+    return [
+        create_update_secret(
+            secret_data_dict={auths_key: auths},
+            name=name,
+            namespace=namespace,
+            admin_client=admin_client,
+        )
+        for (name, namespace), auths in secrets_auths.items()
+    ]
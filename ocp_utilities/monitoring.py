@@ -1,8 +1,12 @@
-import json
 import re
-from json import JSONDecodeError
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ocp_resources.route import Route
 from ocp_resources.secret import Secret
 from ocp_resources.service_account import ServiceAccount
@@ -11,12 +15,58 @@ from simple_logger.logger import get_logger
 
 from ocp_utilities.infra import get_client
 
+try:
+    # orjson is optional, it parses large alerts/targets responses considerably faster than the stdlib json
+    from orjson import JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:
+    from json import JSONDecodeError
+    from json import loads as json_loads
+
 
 TIMEOUT_2MIN = 2 * 60
 TIMEOUT_10MIN = 10 * 60
+# (connect, read) timeouts for Prometheus HTTP API requests
+PROMETHEUS_REQUEST_TIMEOUT = (3.05, 30)
+# Prometheus duration, e.g. 30s, 1m or 1m30s
+PROMETHEUS_DURATION_RE = re.compile(r"(\d+)(ms|s|m|h|d|w|y)")
+PROMETHEUS_DURATION_UNITS_SECONDS = {
+    "ms": 0.001,
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 24 * 60 * 60,
+    "w": 7 * 24 * 60 * 60,
+    "y": 365 * 24 * 60 * 60,
+}
 
 LOGGER = get_logger(name=__name__)
 
+# client -> {(namespace, resource_name): (api_url, scrape_interval)}, entries go away with their client.
+# Tokens are not cached, a new Prometheus instance always picks up a rotated token.
+PROMETHEUS_BOOTSTRAP_CACHE = weakref.WeakKeyDictionary()
+
+
+def parse_prometheus_duration(duration):
+    """
+    Convert a Prometheus duration string to seconds
+
+    Args:
+        duration (str): Prometheus duration, e.g. "30s", "1m" or "1m30s"
+
+    Returns:
+        int: duration in seconds, at least 1
+    """
+    return max(
+        1,
+        int(
+            sum(
+                int(value) * PROMETHEUS_DURATION_UNITS_SECONDS[unit]
+                for value, unit in PROMETHEUS_DURATION_RE.findall(duration)
+            )
+        ),
+    )
+
 
 class Prometheus(object):
     """
@@ -53,9 +103,31 @@ class Prometheus(object):
         self.api_v1 = "/api/v1"
         self.verify_ssl = verify_ssl
         self.bearer_token = bearer_token
-        self.api_url = self._get_route()
-        self.headers = self._get_headers()
-        self.scrape_interval = self.get_scrape_interval()
+        client_bootstrap_cache = PROMETHEUS_BOOTSTRAP_CACHE.setdefault(self.client, {})
+        bootstrap_cache_key = (self.namespace, self.resource_name)
+        scrape_interval = None
+        if cached_bootstrap := client_bootstrap_cache.get(bootstrap_cache_key):
+            self.api_url, scrape_interval = cached_bootstrap
+            self.headers = self._get_headers()
+        else:
+            # Route and token lookups are independent API round trips, fetch the route while getting the token
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                api_url_future = executor.submit(self._get_route)
+                self.headers = self._get_headers()
+                self.api_url = api_url_future.result()
+
+        self.session = self._get_session()
+        self.scrape_interval = scrape_interval or self.get_scrape_interval()
+        client_bootstrap_cache[bootstrap_cache_key] = (self.api_url, self.scrape_interval)
+        # Alerts are re-evaluated once per scrape interval, a response younger than half of it is still current
+        self.alerts_cache_ttl = max(1, self.scrape_interval // 2)
+        self._alerts_cache = None
+        self._alerts_by_name = None
+
+    @staticmethod
+    def clear_cache():
+        """Drop cached routes and scrape intervals, e.g. after the Prometheus route was changed"""
+        PROMETHEUS_BOOTSTRAP_CACHE.clear()
 
     def _get_route(self):
         # get route to prometheus HTTP api
@@ -74,6 +146,25 @@ class Prometheus(object):
 
         return {"Authorization": f"Bearer {self.bearer_token}"}
 
+    def _get_session(self):
+        """Session re-using pooled connections to the Prometheus API, retrying transient gateway errors"""
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+            ),
+        )
+        session.headers.update(self.headers)
+        session.verify = self.verify_ssl
+        return session
+
+    def close(self):
+        """Close the Prometheus API session connections"""
+        self.session.close()
+
     def _get_service_account(self):
         """get service account  for the given namespace and resource"""
 
@@ -89,10 +180,10 @@ class Prometheus(object):
         )
 
     def _get_response(self, query):
-        response = requests.get(f"{self.api_url}{query}", headers=self.headers, verify=self.verify_ssl)
+        response = self.session.get(f"{self.api_url}{query}", timeout=PROMETHEUS_REQUEST_TIMEOUT)
 
         try:
-            return json.loads(response.content)
+            return json_loads(response.content)
         except JSONDecodeError as json_exception:
             LOGGER.error(
                 "Exception converting query response to JSON: "
@@ -125,12 +216,7 @@ class Prometheus(object):
         Returns:
              list: list containing alert metrics
         """
-        alerts = self.alerts()
-        alert_list = []
-        for alert in alerts["data"]["alerts"]:
-            if alert["labels"]["alertname"] == alert_name:
-                alert_list.append(alert)
-        return alert_list
+        return list(self._get_alerts_by_name().get(alert_name, []))
 
     def get_firing_alerts(self, alert_name):
         """
@@ -138,13 +224,14 @@ class Prometheus(object):
         """
         return self.get_alerts_by_state(alert_name=alert_name)
 
-    def wait_for_firing_alert_sampler(self, alert_name, timeout=TIMEOUT_10MIN):
+    def wait_for_firing_alert_sampler(self, alert_name, timeout=TIMEOUT_10MIN, sleep=None):
         """
         Sample output for an alert if found in fired state
 
         Args:
              alert (str): alert name
              timeout (int): wait time, default is 10 mins
+             sleep (int, optional): time between samples, default is the scrape interval
 
         Return:
              sample (list): list of all alerts that match the alert name and in firing state
@@ -152,7 +239,7 @@ class Prometheus(object):
         Raise:
              TimeoutExpiredError: if alert is not fired before wait_timeout
         """
-        return self.wait_for_alert_by_state_sampler(alert_name=alert_name)
+        return self.wait_for_alert_by_state_sampler(alert_name=alert_name, timeout=timeout, sleep=sleep)
 
     def get_scrape_interval(self):
         """
@@ -163,19 +250,19 @@ class Prometheus(object):
         """
         response = self._get_response(query=f"{self.api_v1}/targets")
         result = response.get("data", {}).get("activeTargets", [])
-        for item in result:
-            if item and item["labels"]["job"] == "prometheus-k8s":
-                scrape_interval = item["scrapeInterval"]
-                return int((re.match(r"\d+", scrape_interval)).group())
+        prometheus_target = next((item for item in result if item and item["labels"]["job"] == "prometheus-k8s"), None)
+        if prometheus_target:
+            return parse_prometheus_duration(duration=prometheus_target["scrapeInterval"])
         return 30
 
-    def query_sampler(self, query, timeout=TIMEOUT_2MIN):
+    def query_sampler(self, query, timeout=TIMEOUT_2MIN, sleep=None):
         """
         Sample output for query function
 
         Args:
              query (str): prometheus query string
              wait_timeout (int): default is 2 mins
+             sleep (int, optional): time between samples, default is the scrape interval
 
         Return:
              list: return the query result
@@ -185,7 +272,7 @@ class Prometheus(object):
         """
         sampler = TimeoutSampler(
             wait_timeout=timeout,
-            sleep=self.scrape_interval,
+            sleep=sleep or self.scrape_interval,
             func=self.query,
             query=query,
         )
@@ -201,17 +288,44 @@ class Prometheus(object):
     def alerts(self):
         """
         get all the active alerts
+
+        The response is cached for alerts_cache_ttl seconds, see invalidate_cache.
         """
-        return self._get_response(query=f"{self.api_v1}/alerts")
+        if self._alerts_cache and time.monotonic() - self._alerts_cache[0] < self.alerts_cache_ttl:
+            return self._alerts_cache[1]
+
+        alerts = self._get_response(query=f"{self.api_v1}/alerts")
+        self._alerts_cache = (time.monotonic(), alerts)
+        return alerts
+
+    def invalidate_cache(self):
+        """Drop the cached alerts response, the next alerts lookup will query Prometheus"""
+        self._alerts_cache = None
+        self._alerts_by_name = None
 
     def get_alerts_by_state(self, alert_name, state="firing"):
         """
         get all the alerts from list of active alerts according the state
         """
-        alert_list = self.get_all_alerts_by_alert_name(alert_name=alert_name)
-        return [alert for alert in alert_list if alert["state"] == state]
+        return [alert for alert in self._get_alerts_by_name().get(alert_name, []) if alert["state"] == state]
+
+    def _get_current_alerts_by_state(self, alert_name, state):
+        """get_alerts_by_state from a fresh alerts response, a cached one would hide state changes between samples"""
+        self.invalidate_cache()
+        return self.get_alerts_by_state(alert_name=alert_name, state=state)
+
+    def _get_alerts_by_name(self):
+        """Active alerts grouped by alert name, built once per alerts response"""
+        alerts = self.alerts()
+        if not self._alerts_by_name or self._alerts_by_name[0] is not alerts:
+            alerts_by_name = defaultdict(list)
+            for alert in alerts["data"]["alerts"]:
+                alerts_by_name[alert["labels"]["alertname"]].append(alert)
+            self._alerts_by_name = (alerts, dict(alerts_by_name))
+
+        return self._alerts_by_name[1]
 
-    def wait_for_alert_by_state_sampler(self, alert_name, timeout=TIMEOUT_10MIN, state="firing"):
+    def wait_for_alert_by_state_sampler(self, alert_name, timeout=TIMEOUT_10MIN, state="firing", sleep=None):
         """
         Sample output for an alert if found in the state provided in the args.
 
@@ -219,6 +333,8 @@ class Prometheus(object):
              alert_name (str): alert name
              timeout (int): wait time, default is 10 mins
              state (str): state of the alert to expect, default is firing
+             sleep (int, optional): time between samples, default is the scrape interval.
+                Every sample queries Prometheus, cached alerts responses are not used
 
         Return:
              sample (list): list of all alerts that match the alert name and in the state provided in args.
@@ -228,8 +344,8 @@ class Prometheus(object):
         """
         sampler = TimeoutSampler(
             wait_timeout=timeout,
-            sleep=self.scrape_interval,
-            func=self.get_alerts_by_state,
+            sleep=sleep or self.scrape_interval,
+            func=self._get_current_alerts_by_state,
             alert_name=alert_name,
             state=state,
         )
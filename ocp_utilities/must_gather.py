@@ -1,5 +1,6 @@
-import shlex
 import shutil
+import tempfile
+import threading
 from pathlib import Path
 import os
 
@@ -38,22 +39,38 @@ def run_must_gather(
     Returns:
         str: command output
     """
-    base_command = "oc adm must-gather"
+    base_command = ["oc", "adm", "must-gather"]
     if target_base_dir:
-        base_command += f" --dest-dir={target_base_dir}"
+        base_command.append(f"--dest-dir={target_base_dir}")
     if image_url:
-        base_command += f" --image={image_url}"
+        base_command.append(f"--image={image_url}")
     if skip_tls_check:
-        base_command += " --insecure-skip-tls-verify"
+        base_command.append("--insecure-skip-tls-verify")
     if kubeconfig:
-        base_command += f" --kubeconfig {kubeconfig}"
+        base_command.extend(["--kubeconfig", kubeconfig])
     if script_name:
-        base_command += f" -- {script_name}"
+        base_command.extend(["--", script_name])
     # flag_name must be the last argument
     if flag_names:
-        flag_string = "".join([f" --{flag_name}" for flag_name in flag_names])
-        base_command += f" {flag_string}"
-    return run_command(command=shlex.split(base_command), check=False)[1]
+        base_command.extend(f"--{flag_name}" for flag_name in flag_names)
+    return run_command(command=base_command, check=False)[1]
+
+
+def _remove_dir_in_background(dir_path):
+    # Move the directory aside so the path is free immediately, a partial must-gather can take long to delete
+    if not os.path.exists(dir_path):
+        return
+
+    trash_dir = tempfile.mkdtemp(prefix=".trash-", dir=os.path.dirname(dir_path))
+    try:
+        os.rename(dir_path, os.path.join(trash_dir, os.path.basename(dir_path)))
+    except FileNotFoundError:
+        # Removed meanwhile, do not leave the empty trash directory behind
+        os.rmdir(trash_dir)
+        return
+
+    # Not a daemon thread, interpreter exit waits for the deletion to finish
+    threading.Thread(target=shutil.rmtree, kwargs={"path": trash_dir, "ignore_errors": True}).start()
 
 
 def collect_must_gather(must_gather_output_dir, cluster_name, product_name, kubeconfig_path=None):
@@ -85,4 +102,4 @@ def collect_must_gather(must_gather_output_dir, cluster_name, product_name, kube
         )
 
         LOGGER.info(f"Delete must-gather target directory {target_dir}.")
-        shutil.rmtree(target_dir)
+        _remove_dir_in_background(dir_path=target_dir)
@@ -1,6 +1,11 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
 
-from kubernetes.dynamic.exceptions import ResourceNotFoundError
+from kubernetes.client.rest import ApiException
+from kubernetes.dynamic.exceptions import NotFoundError, ResourceNotFoundError
+from kubernetes.dynamic.resource import ResourceInstance
+from kubernetes.watch import Watch
 from ocp_resources.catalog_source import CatalogSource
 from ocp_resources.cluster_service_version import ClusterServiceVersion
 from ocp_resources.image_content_source_policy import ImageContentSourcePolicy
@@ -15,6 +20,8 @@ from ocp_resources.validating_webhook_config import ValidatingWebhookConfigurati
 from simple_logger.logger import get_logger
 from ocp_utilities.must_gather import collect_must_gather
 
+from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+
 from ocp_utilities.infra import cluster_resource, create_icsp, create_update_secret
 
 
@@ -22,6 +29,99 @@ LOGGER = get_logger(name=__name__)
 TIMEOUT_5MIN = 5 * 60
 TIMEOUT_10MIN = 10 * 60
 TIMEOUT_30MIN = 30 * 60
+BREW_REGISTRY = "brew.registry.redhat.io"
+# Delay before restarting a failed watch connection, doubled on every consecutive failure
+WATCH_RETRY_MIN_DELAY = 1
+WATCH_RETRY_MAX_DELAY = 10
+# (connect, read) timeouts for reading the watched resource
+WATCH_RESOURCE_READ_TIMEOUT = (5, 5)
+# Longest single watch request, a stalled stream is detected by the read timeout within one window
+WATCH_WINDOW_SECONDS = 60
+
+
+def _watch_resource(resource, predicate, timeout):
+    """
+    Wait for a resource to match a predicate, using a watch instead of polling.
+
+    The current resource state is checked first, then changes are watched from its resourceVersion.
+    Expired (410 Gone), dropped and timed out watch streams are restarted until timeout, failed connections
+    are retried with an exponential backoff. Requests have a client side read timeout, a control plane that
+    stops responding does not block the wait past its deadline.
+
+    Args:
+        resource (Resource): Resource to watch.
+        predicate (callable): Called with the resource instance on every change, the wait ends when it
+            returns a truthy value.
+        timeout (int): Timeout in seconds.
+
+    Returns:
+        any: The predicate result.
+
+    Raises:
+        TimeoutExpiredError: If the predicate is not met before timeout.
+    """
+    deadline = time.monotonic() + timeout
+    resource_api = resource.api
+    resource_version = None
+    retry_delay = WATCH_RETRY_MIN_DELAY
+    while True:
+        try:
+            # The current state is checked even when no time is left, e.g. for a zero timeout
+            if resource_version is None:
+                try:
+                    resource_instance = resource_api.get(
+                        name=resource.name,
+                        namespace=resource.namespace,
+                        _request_timeout=WATCH_RESOURCE_READ_TIMEOUT,
+                    )
+                except NotFoundError:
+                    resource_instance = None
+
+                if resource_instance and (result := predicate(resource_instance)):
+                    return result
+
+                resource_version = resource_instance.metadata.resourceVersion if resource_instance else ""
+
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                break
+
+            # resource.api.watch() can not set a client side read timeout, drive the watch stream directly.
+            # The server ends a healthy stream after window_seconds, the read timeout only trips on a stalled one.
+            window_seconds = max(1, int(min(remaining_time, WATCH_WINDOW_SECONDS)))
+            for event in Watch().stream(
+                resource_api.get,
+                namespace=resource.namespace,
+                field_selector=f"metadata.name={resource.name}",
+                resource_version=resource_version or None,
+                timeout_seconds=window_seconds,
+                serialize=False,
+                _request_timeout=(WATCH_RESOURCE_READ_TIMEOUT[0], window_seconds + WATCH_RESOURCE_READ_TIMEOUT[1]),
+            ):
+                retry_delay = WATCH_RETRY_MIN_DELAY
+                event_object = ResourceInstance(resource_api.client, event["object"])
+                resource_version = event_object.metadata.resourceVersion
+                if event["type"] != "DELETED" and (result := predicate(event_object)):
+                    return result
+
+        except ApiException as exp:
+            if exp.status != 410:
+                raise
+
+            # Watch history expired, re-read the resource and watch from its current version
+            resource_version = None
+
+        except (MaxRetryError, ProtocolError, ReadTimeoutError) as exp:
+            # Connection dropped or stalled, resume from the last seen version; the deadline still bounds the wait
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                break
+
+            LOGGER.warning(f"{resource.kind} {resource.name} watch connection failed, restarting: {exp}")
+            time.sleep(min(retry_delay, remaining_time))
+            retry_delay = min(retry_delay * 2, WATCH_RETRY_MAX_DELAY)
+
+    raise TimeoutExpiredError(value=f"{resource.kind} {resource.name} did not reach the expected state")
 
 
 def wait_for_install_plan_from_subscription(admin_client, subscription, timeout=TIMEOUT_5MIN):
@@ -41,41 +141,77 @@ def wait_for_install_plan_from_subscription(admin_client, subscription, timeout=
 
     """
     LOGGER.info(f"Wait for install plan to be created for subscription {subscription.name}.")
-    install_plan_sampler = TimeoutSampler(
-        wait_timeout=timeout,
-        sleep=30,
-        func=lambda: subscription.instance.status.installplan,
-    )
     try:
-        for install_plan in install_plan_sampler:
-            if install_plan:
-                LOGGER.info(f"Install plan found {install_plan}.")
-                return cluster_resource(InstallPlan)(
-                    client=admin_client,
-                    name=install_plan["name"],
-                    namespace=subscription.namespace,
-                )
+        install_plan = _watch_resource(
+            resource=subscription,
+            predicate=lambda subscription_instance: (
+                subscription_instance.status and subscription_instance.status.installplan
+            ),
+            timeout=timeout,
+        )
     except TimeoutExpiredError:
+        subscription_instance = subscription.exists
+        subscription_status = subscription_instance.to_dict().get("status", {}) if subscription_instance else None
         LOGGER.error(
-            f"Subscription: {subscription.name}, did not get updated with install plan: {pformat(subscription)}"
+            f"Subscription: {subscription.name}, did not get updated with install plan. "
+            f"Subscription status: {pformat(subscription_status)}"
         )
         raise
 
+    LOGGER.info(f"Install plan found {install_plan}.")
+    return cluster_resource(InstallPlan)(
+        client=admin_client,
+        name=install_plan["name"],
+        namespace=subscription.namespace,
+    )
+
+
+def _get_resource_phase(resource_instance):
+    return resource_instance.status.phase if resource_instance and resource_instance.status else None
+
 
 def wait_for_operator_install(admin_client, subscription, timeout=TIMEOUT_5MIN):
     """
     Wait for the operator to be installed, including InstallPlan and CSV ready.
 
+    InstallPlan, installedCSV and CSV states are watched one after the other, each with its own timeout.
+
     Args:
         admin_client (DynamicClient): Cluster client.
         subscription (Subscription): Subscription instance.
-        timeout (int): Timeout in seconds to wait for operator to be installed.
+        timeout (int): Timeout in seconds to wait for the InstallPlan to be complete.
+
+    Raises:
+        TimeoutExpiredError: If the InstallPlan is not complete or the CSV did not succeed before timeout.
     """
     install_plan = wait_for_install_plan_from_subscription(admin_client=admin_client, subscription=subscription)
-    install_plan.wait_for_status(status=install_plan.Status.COMPLETE, timeout=timeout)
-    wait_for_csv_successful_state(
-        admin_client=admin_client,
-        subscription=subscription,
+    LOGGER.info(f"Wait for install plan {install_plan.name} to be {install_plan.Status.COMPLETE}.")
+    _watch_resource(
+        resource=install_plan,
+        predicate=lambda install_plan_instance: (
+            _get_resource_phase(resource_instance=install_plan_instance) == install_plan.Status.COMPLETE
+        ),
+        timeout=timeout,
+    )
+
+    LOGGER.info(f"Wait Subscription {subscription.name} installedCSV.")
+    csv_name = _watch_resource(
+        resource=subscription,
+        predicate=lambda subscription_instance: (
+            subscription_instance.status and subscription_instance.status.installedCSV
+        ),
+        timeout=30,
+    )
+    csv = cluster_resource(ClusterServiceVersion)(
+        client=admin_client,
+        namespace=subscription.namespace,
+        name=csv_name,
+    )
+    LOGGER.info(f"Wait for CSV {csv_name} to be {csv.Status.SUCCEEDED}.")
+    _watch_resource(
+        resource=csv,
+        predicate=lambda csv_instance: _get_resource_phase(resource_instance=csv_instance) == csv.Status.SUCCEEDED,
+        timeout=TIMEOUT_10MIN,
     )
 
 
@@ -93,18 +229,20 @@ def wait_for_csv_successful_state(admin_client, subscription, timeout=TIMEOUT_10
         LOGGER.info(f"Wait Subscription {_subscription.name} installedCSV.")
         for sample in TimeoutSampler(
             wait_timeout=30,
-            sleep=1,
+            sleep=2,
             func=lambda: _subscription.instance.status.installedCSV,
         ):
             if sample:
                 return sample
 
-    csv = get_csv_by_name(
+    csv, csv_instance = _get_csv_and_instance_by_name(
         csv_name=_wait_for_subscription_installed_csv(_subscription=subscription),
         admin_client=admin_client,
         namespace=subscription.namespace,
     )
-    csv.wait_for_status(status=csv.Status.SUCCEEDED, timeout=timeout)
+    # The CSV was just fetched, only wait (and fetch again) if it did not succeed yet
+    if _get_resource_phase(resource_instance=csv_instance) != csv.Status.SUCCEEDED:
+        csv.wait_for_status(status=csv.Status.SUCCEEDED, timeout=timeout)
 
 
 def get_csv_by_name(admin_client, csv_name, namespace):
@@ -122,9 +260,13 @@ def get_csv_by_name(admin_client, csv_name, namespace):
     Raises:
         NotFoundError: when a given CSV is not found in a given namespace
     """
+    return _get_csv_and_instance_by_name(admin_client=admin_client, csv_name=csv_name, namespace=namespace)[0]
+
+
+def _get_csv_and_instance_by_name(admin_client, csv_name, namespace):
     csv = cluster_resource(ClusterServiceVersion)(client=admin_client, namespace=namespace, name=csv_name)
-    if csv.exists:
-        return csv
+    if csv_instance := csv.exists:
+        return csv, csv_instance
     raise ResourceNotFoundError(f"CSV {csv_name} not found in namespace: {namespace}")
 
 
@@ -146,6 +288,9 @@ def install_operator(
     """
     Install operator on cluster.
 
+    If the operator Subscription already exists with the same channel and source, the catalog image and
+    OperatorGroup target namespaces are unchanged and its installed CSV succeeded, the install is skipped.
+
     Args:
         admin_client (DynamicClient): Cluster client.
         name (str): Name of the operator to install.
@@ -165,44 +310,74 @@ def install_operator(
     Raises:
         ValueError: When either one of them not provided (source, source_image, iib_index_image)
     """
-    catalog_source = None
     operator_market_namespace = "openshift-marketplace"
 
     if must_gather_output_dir:
         if not cluster_name:
             raise ValueError("'cluster_name' param is required for running must-gather of cluster")
+
+    if iib_index_image:
+        if not brew_token:
+            raise ValueError("brew_token must be provided for iib_index_image")
+
+        source_name = f"iib-catalog-{name.lower()}"
+        catalog_image = _get_brew_iib_index_image(iib_index_image=iib_index_image)
+    elif source_image:
+        source_name = f"catalog-{name}"
+        catalog_image = source_image
+    else:
+        if not source:
+            raise ValueError("source must be provided if not using iib_index_image or source_image")
+
+        source_name = source
+        catalog_image = None
+
+    operator_namespace = operator_namespace or name
     try:
-        if iib_index_image:
-            if not brew_token:
-                raise ValueError("brew_token must be provided for iib_index_image")
+        if _is_operator_installed(
+            admin_client=admin_client,
+            name=name,
+            channel=channel,
+            operator_namespace=operator_namespace,
+            source=source_name,
+            source_namespace=operator_market_namespace,
+            catalog_image=catalog_image,
+            target_namespaces=target_namespaces,
+        ):
+            LOGGER.info(
+                f"Operator {name} is already installed from channel {channel} and source {source_name}, skipping install."
+            )
+            return
 
-            catalog_source = create_catalog_source_for_iib_install(
-                name=f"iib-catalog-{name.lower()}",
+        if iib_index_image:
+            create_catalog_source_for_iib_install(
+                name=source_name,
                 iib_index_image=iib_index_image,
                 brew_token=brew_token,
                 operator_market_namespace=operator_market_namespace,
                 admin_client=admin_client,
             )
         elif source_image:
-            source_name = f"catalog-{name}"
-            catalog_source = create_catalog_source_from_image(
+            create_catalog_source_from_image(
                 admin_client=admin_client,
                 name=source_name,
                 namespace=operator_market_namespace,
                 image=source_image,
             )
-        else:
-            if not source:
-                raise ValueError("source must be provided if not using iib_index_image or source_image")
 
-        operator_namespace = operator_namespace or name
         if target_namespaces:
-            for namespace in target_namespaces:
-                ns = Namespace(client=admin_client, name=namespace)
-                if ns.exists:
-                    continue
-
-                ns.deploy(wait=True)
+            # One LIST instead of a GET per target namespace
+            existing_namespaces = {namespace.name for namespace in Namespace.get(dyn_client=admin_client)}
+            missing_namespaces = [namespace for namespace in target_namespaces if namespace not in existing_namespaces]
+            if missing_namespaces:
+                # Namespaces are independent, deploy and wait for them concurrently
+                with ThreadPoolExecutor(max_workers=min(16, len(missing_namespaces))) as executor:
+                    list(
+                        executor.map(
+                            lambda namespace: Namespace(client=admin_client, name=namespace).deploy(wait=True),
+                            missing_namespaces,
+                        )
+                    )
 
         else:
             ns = Namespace(client=admin_client, name=operator_namespace)
@@ -221,7 +396,7 @@ def install_operator(
             name=name,
             namespace=operator_namespace,
             channel=channel,
-            source=catalog_source.name if catalog_source else source,
+            source=source_name,
             source_namespace=operator_market_namespace,
             install_plan_approval="Automatic",
         )
@@ -243,6 +418,51 @@ def install_operator(
         raise
 
 
+def _is_operator_installed(
+    admin_client,
+    name,
+    channel,
+    operator_namespace,
+    source,
+    source_namespace,
+    catalog_image,
+    target_namespaces,
+):
+    subscription_instance = Subscription(client=admin_client, name=name, namespace=operator_namespace).exists
+    if not (
+        subscription_instance
+        and subscription_instance.spec.channel == channel
+        and subscription_instance.spec.source == source
+        and subscription_instance.spec.sourceNamespace == source_namespace
+        and subscription_instance.status
+        and subscription_instance.status.installedCSV
+    ):
+        return False
+
+    if catalog_image:
+        # Image based catalog sources keep their name, a new image must be installed
+        catalog_source_instance = CatalogSource(client=admin_client, name=source, namespace=source_namespace).exists
+        if not (catalog_source_instance and catalog_source_instance.spec.image == catalog_image):
+            return False
+
+    operator_group_instance = OperatorGroup(client=admin_client, name=name, namespace=operator_namespace).exists
+    if not operator_group_instance:
+        return False
+
+    installed_target_namespaces = (
+        operator_group_instance.spec.targetNamespaces if operator_group_instance.spec else None
+    )
+    if sorted(installed_target_namespaces or []) != sorted(target_namespaces or []):
+        return False
+
+    csv = cluster_resource(ClusterServiceVersion)(
+        client=admin_client,
+        namespace=operator_namespace,
+        name=subscription_instance.status.installedCSV,
+    )
+    return _get_resource_phase(resource_instance=csv.exists) == csv.Status.SUCCEEDED
+
+
 def uninstall_operator(
     admin_client,
     name,
@@ -261,6 +481,8 @@ def uninstall_operator(
 
     csv_name = None
     operator_namespace = operator_namespace or name
+    # Deletions are issued without waiting, then all resources are waited for together
+    resources_timeouts = []
     subscription = Subscription(
         client=admin_client,
         name=name,
@@ -268,21 +490,23 @@ def uninstall_operator(
     )
     if subscription.exists:
         csv_name = subscription.instance.status.installedCSV
-        subscription.clean_up()
+        subscription.delete(wait=False)
+        resources_timeouts.append((subscription, subscription.delete_timeout))
 
-    OperatorGroup(
+    operator_group = OperatorGroup(
         client=admin_client,
         name=name,
         namespace=operator_namespace,
-    ).clean_up()
+    )
+    operator_group.delete(wait=False)
+    resources_timeouts.append((operator_group, operator_group.delete_timeout))
 
-    for _operator in Operator.get(dyn_client=admin_client):
-        if _operator.name.startswith(name):
-            # operator name convention is <name>.<namespace>
-            namespace = operator_namespace or name.split(".")[-1]
-            ns = Namespace(client=admin_client, name=namespace)
-            if ns.exists:
-                ns.clean_up()
+    # operator name convention is <name>.<namespace>, get it directly instead of listing all operators
+    if Operator(client=admin_client, name=f"{name}.{operator_namespace}").exists:
+        ns = Namespace(client=admin_client, name=operator_namespace)
+        if ns.exists:
+            ns.delete(wait=False)
+            resources_timeouts.append((ns, ns.delete_timeout))
 
     if csv_name:
         csv = ClusterServiceVersion(
@@ -290,8 +514,15 @@ def uninstall_operator(
             namespace=subscription.namespace,
             name=csv_name,
         )
+        resources_timeouts.append((csv, timeout))
 
-        csv.wait_deleted(timeout=timeout)
+    with ThreadPoolExecutor(max_workers=len(resources_timeouts)) as executor:
+        wait_deleted_futures = [
+            executor.submit(resource.wait_deleted, timeout=resource_timeout)
+            for resource, resource_timeout in resources_timeouts
+        ]
+        for wait_deleted_future in wait_deleted_futures:
+            wait_deleted_future.result()
 
 
 def create_catalog_source_for_iib_install(
@@ -335,19 +566,18 @@ def create_catalog_source_for_iib_install(
                 repository_digest_mirrors=_repository_digest_mirrors,
             )
 
-    brew_registry = "brew.registry.redhat.io"
     source_iib_registry = iib_index_image.split("/")[0]
-    _iib_index_image = iib_index_image.replace(source_iib_registry, brew_registry)
+    _iib_index_image = _get_brew_iib_index_image(iib_index_image=iib_index_image)
     icsp = ImageContentSourcePolicy(name="brew-registry")
     validating_webhook_configuration = ValidatingWebhookConfiguration(name="sre-imagecontentpolicies-validation")
     repository_digest_mirrors = [
         {
             "source": source_iib_registry,
-            "mirrors": [brew_registry],
+            "mirrors": [BREW_REGISTRY],
         },
         {
             "source": "registry.redhat.io",
-            "mirrors": [brew_registry],
+            "mirrors": [BREW_REGISTRY],
         },
     ]
 
@@ -365,7 +595,7 @@ def create_catalog_source_for_iib_install(
     else:
         _icsp(_repository_digest_mirrors=repository_digest_mirrors)
 
-    secret_data_dict = {"auths": {brew_registry: {"auth": brew_token}}}
+    secret_data_dict = {"auths": {BREW_REGISTRY: {"auth": brew_token}}}
     create_update_secret(
         secret_data_dict=secret_data_dict,
         name="pull-secret",  # pragma: allowlist secret
@@ -382,6 +612,10 @@ def create_catalog_source_for_iib_install(
     return iib_catalog_source
 
 
+def _get_brew_iib_index_image(iib_index_image):
+    return iib_index_image.replace(iib_index_image.split("/")[0], BREW_REGISTRY)
+
+
 def create_catalog_source_from_image(
     name, namespace, image, source_type=None, update_strategy_registry_poll_interval=None, admin_client=None
 ):
@@ -53,17 +53,11 @@ def run_command(
     out_decoded = sub_process.stdout
     err_decoded = sub_process.stderr
 
-    error_msg = (
-        f"Failed to run {command_for_log}. rc: {sub_process.returncode}, out: {out_decoded}, error: {err_decoded}"
-    )
-
-    if sub_process.returncode != 0:
-        LOGGER.error(error_msg)
-        return False, out_decoded, err_decoded
-
-    # From this point and onwards we are guaranteed that sub_process.returncode == 0
-    if err_decoded and verify_stderr:
-        LOGGER.error(error_msg)
+    # Failed on non-zero rc, or on rc == 0 with stderr output when verify_stderr is set
+    if sub_process.returncode != 0 or (err_decoded and verify_stderr):
+        LOGGER.error(
+            f"Failed to run {command_for_log}. rc: {sub_process.returncode}, out: {out_decoded}, error: {err_decoded}"
+        )
         return False, out_decoded, err_decoded
 
     return True, out_decoded, err_decoded